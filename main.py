@@ -5,11 +5,21 @@ Creates real playlists with authentic Afrobeats content only
 """
 
 import os
-import json
+import asyncio
+import logging
 import time
 import webbrowser
 import re
-from datetime import datetime, timedelta
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from heapq import nlargest
+from operator import itemgetter
+import ahocorasick
+import aiohttp
+import orjson
 from dotenv import load_dotenv
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -19,6 +29,74 @@ from google.oauth2.credentials import Credentials
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+_URL_RE = re.compile(r'https?://\S+')
+
+def _chunks(items, size):
+    """Yield consecutive slices of at most `size` items"""
+    if not isinstance(items, (list, tuple)):
+        items = tuple(items)
+    for i in range(0, len(items), size):
+        yield items[i:i+size]
+
+def _normalize_terms(terms):
+    """Lowercase filter terms once; they are matched against lowercased text"""
+    return tuple(term.lower() for term in terms)
+
+class SearchAPIError(Exception):
+    """Error response from the raw REST search endpoint"""
+    
+    def __init__(self, status, body):
+        self.status = status
+        self.reason = ''
+        self.message = ''
+        try:
+            error = orjson.loads(body).get('error', {})
+            errors = error.get('errors') or [{}]
+            self.reason = errors[0].get('reason', '')
+            self.message = error.get('message', '')
+        except (ValueError, AttributeError):
+            self.message = body.decode('utf-8', 'replace')[:200]
+        super().__init__(f"{status} {self.reason}: {self.message}" if self.reason else f"{status}: {self.message}")
+
+class TokenBucket:
+    """Thread-safe token bucket for pacing API calls"""
+    
+    def __init__(self, rate, capacity=None):
+        self.rate = rate                   # Tokens added per second
+        self.capacity = max(1, capacity or rate)   # Largest burst (at least one token)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _take(self):
+        """Take a token if one is available, otherwise return how long to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+    
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+    
+    async def acquire_async(self):
+        """Await until a token is available, then take it"""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
 class AfrobeatsPlaylistGenerator:
     
     SCOPES = [
@@ -26,15 +104,28 @@ class AfrobeatsPlaylistGenerator:
         'https://www.googleapis.com/auth/youtube'
     ]
     
+    SEARCH_URL = 'https://www.googleapis.com/youtube/v3/search'
+    
     def __init__(self):
         self.youtube = None
         self.credentials = None
+        self._build_kwargs = {}
+        self._local = threading.local()
+        
+        # Concurrent searches and stats batches; every API call is paced to the per-minute quota
+        self.search_workers = 6
+        self.stats_workers = 4
+        self.stats_cache_file = 'stats_cache.json'
+        self.api_calls_per_minute = 300
+        self._api_limiter = TokenBucket(rate=self.api_calls_per_minute / 60)
         
         # Stricter criteria for up-and-coming artists
         self.max_subscribers = 250000      # Even smaller artists
         self.max_channel_views = 3000000   # Less established
         self.min_video_views = 5000        # Must have decent traction
         self.max_video_age_days = 45       # Very recent content
+        self.search_window_days = 9        # Split the period into bins per keyword
+        self.max_description_chars = 500   # Description prefix used for scoring
         
         # STRICT Afrobeats keywords - only authentic terms
         self.afrobeats_keywords = [
@@ -68,8 +159,32 @@ class AfrobeatsPlaylistGenerator:
             'fuji music', 'makossa', 'soukous', 'reggae', 'dancehall'
         ]
         
+        # Generic music indicators
+        self.music_terms = ['music', 'song', 'track', 'official', 'video']
+        
+        # Freeze the term lists, lowercased, before compiling the matchers
+        self.required_afrobeats_terms = _normalize_terms(self.required_afrobeats_terms)
+        self.african_music_terms = _normalize_terms(self.african_music_terms)
+        self.exclude_terms = _normalize_terms(self.exclude_terms)
+        self.music_terms = _normalize_terms(self.music_terms)
+        
+        self._exclude_re = re.compile('|'.join(re.escape(t) for t in self.exclude_terms))
+        self._build_term_automaton()
         self._setup_youtube()
     
+    def _build_term_automaton(self):
+        """Compile the scoring terms into one Aho-Corasick automaton tagged by category"""
+        self._ac = ahocorasick.Automaton()
+        categories = {
+            'required': self.required_afrobeats_terms,
+            'african': self.african_music_terms,
+            'music': self.music_terms
+        }
+        for category, terms in categories.items():
+            for term in terms:
+                self._ac.add_word(term, (category, term))
+        self._ac.make_automaton()
+    
     def _setup_youtube(self):
         """Setup YouTube API with proper authentication"""
         try:
@@ -95,7 +210,8 @@ class AfrobeatsPlaylistGenerator:
                 with open('token.json', 'w') as token:
                     token.write(self.credentials.to_json())
             
-            self.youtube = build('youtube', 'v3', credentials=self.credentials)
+            self._build_kwargs = {'credentials': self.credentials}
+            self.youtube = build('youtube', 'v3', **self._build_kwargs)
             print("✅ YouTube API ready with full access!")
             
             # Test if we can actually create playlists
@@ -114,7 +230,8 @@ class AfrobeatsPlaylistGenerator:
             print("📝 Add YOUTUBE_API_KEY=your_key to .env file")
             exit(1)
         
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+        self._build_kwargs = {'developerKey': api_key}
+        self.youtube = build('youtube', 'v3', **self._build_kwargs)
         self.can_create_playlists = False
         print("✅ YouTube API ready (discovery mode only)")
     
@@ -122,7 +239,7 @@ class AfrobeatsPlaylistGenerator:
         """Test if we can create playlists"""
         try:
             # Try to list user's playlists
-            self.youtube.playlists().list(part='id', mine=True, maxResults=1).execute()
+            self._api_call(self.youtube.playlists().list(part='id', mine=True, maxResults=1))
             self.can_create_playlists = True
             print("✅ Playlist creation enabled!")
         except HttpError as e:
@@ -131,169 +248,339 @@ class AfrobeatsPlaylistGenerator:
                 print("💡 Go to youtube.com and create a channel first!")
             self.can_create_playlists = False
     
+    def _api_call(self, request):
+        """Execute an API request once the rate limiter allows it"""
+        self._api_limiter.acquire()
+        return request.execute()
+    
+    def _service(self):
+        """Per-thread YouTube client (the discovery client's httplib2 transport is not thread-safe)"""
+        if threading.current_thread() is threading.main_thread():
+            return self.youtube
+        if not hasattr(self._local, 'youtube'):
+            self._local.youtube = build('youtube', 'v3', **self._build_kwargs)
+        return self._local.youtube
+    
     def is_authentic_afrobeats(self, title, description, channel_title, tags=None):
         """STRICT filtering for authentic Afrobeats content only"""
         if tags is None:
             tags = []
         
+        # Only the start of the description carries signal; links carry none
+        description = _URL_RE.sub('', description[:self.max_description_chars])
+        
         # Combine all text
         all_text = f"{title} {description} {channel_title} {' '.join(tags)}".lower()
         
         # Must NOT contain excluded terms
-        for exclude in self.exclude_terms:
-            if exclude in all_text:
-                return False
-        
-        # Count Afrobeats indicators
-        afrobeats_score = 0
-        for term in self.required_afrobeats_terms:
-            if term in all_text:
-                afrobeats_score += 1
-        
-        # Count African music indicators
-        african_score = 0
-        for term in self.african_music_terms:
-            if term in all_text:
-                african_score += 1
+        if self._exclude_re.search(all_text):
+            return False
+        
+        # Single pass over the text collects the distinct terms hit per category
+        hits = defaultdict(set)
+        for _, (category, term) in self._ac.iter(all_text):
+            hits[category].add(term)
+        
+        afrobeats_score = len(hits['required'])
+        african_score = len(hits['african'])
         
         # STRICT requirement: Must have at least 2 Afrobeats terms OR 1 Afrobeats + 1 African
         is_afrobeats = (afrobeats_score >= 2) or (afrobeats_score >= 1 and african_score >= 1)
         
         # Additional checks
-        has_music_terms = any(term in all_text for term in ['music', 'song', 'track', 'official', 'video'])
+        has_music_terms = bool(hits['music'])
         
-        # Debug output for first few videos
-        if afrobeats_score > 0:
-            print(f"   🔍 Checking: {title[:30]}... | Afrobeats:{afrobeats_score} African:{african_score} Music:{has_music_terms} = {'✅' if is_afrobeats and has_music_terms else '❌'}")
+        # Debug output, only formatted when LOG_LEVEL=DEBUG
+        if afrobeats_score > 0 and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   🔍 Checking: %s... | Afrobeats:%d African:%d Music:%s = %s",
+                         title[:30], afrobeats_score, african_score, has_music_terms,
+                         '✅' if is_afrobeats and has_music_terms else '❌')
         
         return is_afrobeats and has_music_terms
     
+    def _search_windows(self):
+        """Split the search period into (publishedAfter, publishedBefore) bins, newest first"""
+        # The API reads these as RFC 3339 UTC, so the bounds must be real UTC times
+        end = datetime.now(timezone.utc)
+        start = end - timedelta(days=self.max_video_age_days)
+        windows = []
+        while end > start:
+            window_start = max(start, end - timedelta(days=self.search_window_days))
+            windows.append((window_start.strftime('%Y-%m-%dT%H:%M:%SZ'), end.strftime('%Y-%m-%dT%H:%M:%SZ')))
+            end = window_start
+        return windows
+    
+    def _search_headers(self):
+        """Auth headers for raw REST calls (keeps the API key out of URLs and error messages)"""
+        if 'developerKey' in self._build_kwargs:
+            return {'X-Goog-Api-Key': self._build_kwargs['developerKey']}
+        
+        if not self.credentials.valid:
+            self.credentials.refresh(Request())
+        headers = {}
+        self.credentials.apply(headers)
+        return headers
+    
+    async def _search_one(self, session, semaphore, keyword, published_after, published_before):
+        """Run a single keyword search over one time window and return the candidate videos"""
+        params = {
+            'q': keyword,
+            'part': 'id,snippet',
+            'type': 'video',
+            'videoCategoryId': '10',  # Music only
+            'order': 'viewCount',     # Most viewed first
+            'maxResults': 50,         # Same quota cost as 20
+            'publishedAfter': published_after,
+            'publishedBefore': published_before,
+            'regionCode': 'NG',       # Nigeria focus
+            'fields': 'items(id/videoId,snippet(title,channelId,channelTitle,publishedAt,description,thumbnails/medium/url))'
+        }
+        
+        async with semaphore:
+            await self._api_limiter.acquire_async()
+            async with session.get(self.SEARCH_URL, params=params) as response:
+                body = await response.read()
+                if response.status >= 400:
+                    raise SearchAPIError(response.status, body)
+                search_response = orjson.loads(body)
+        
+        return [
+            {
+                'video_id': item['id']['videoId'],
+                'title': item['snippet']['title'],
+                'channel_id': item['snippet']['channelId'],
+                'channel_title': item['snippet']['channelTitle'],
+                'published_at': item['snippet']['publishedAt'],
+                'description': item['snippet']['description'],
+                'thumbnail': item['snippet']['thumbnails']['medium']['url']
+            }
+            for item in search_response['items']
+        ]
+    
+    async def _search_all(self, windows):
+        """Run all keyword/window searches over one HTTP session; returns per-keyword results or exceptions"""
+        semaphore = asyncio.Semaphore(self.search_workers)
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(headers=self._search_headers(), timeout=timeout) as session:
+            results = await asyncio.gather(
+                *(self._search_one(session, semaphore, keyword, after, before)
+                  for keyword in self.afrobeats_keywords
+                  for after, before in windows),
+                return_exceptions=True
+            )
+        
+        per_keyword = len(windows)
+        return [results[i:i+per_keyword] for i in range(0, len(results), per_keyword)]
+    
     def search_afrobeats_videos(self):
         """Search with STRICT Afrobeats filtering"""
         print("🔍 Searching for AUTHENTIC Afrobeats content only...")
-        afrobeats_videos = []
-        
-        cutoff_date = datetime.now() - timedelta(days=self.max_video_age_days)
-        published_after = cutoff_date.isoformat() + 'Z'
-        
-        for keyword in self.afrobeats_keywords:
-            try:
-                print(f"\n   🎯 Searching: {keyword}")
-                
-                search_response = self.youtube.search().list(
-                    q=keyword,
-                    part='id,snippet',
-                    type='video',
-                    videoCategoryId='10',  # Music only
-                    order='viewCount',     # Most viewed first
-                    maxResults=20,
-                    publishedAfter=published_after,
-                    regionCode='NG'        # Nigeria focus
-                ).execute()
-                
-                keyword_videos = 0
-                for item in search_response['items']:
-                    video = {
-                        'video_id': item['id']['videoId'],
-                        'title': item['snippet']['title'],
-                        'channel_id': item['snippet']['channelId'],
-                        'channel_title': item['snippet']['channelTitle'],
-                        'published_at': item['snippet']['publishedAt'],
-                        'description': item['snippet']['description'],
-                        'thumbnail': item['snippet']['thumbnails']['medium']['url']
-                    }
-                    
-                    # STRICT filtering
-                    if self.is_authentic_afrobeats(
-                        video['title'], 
-                        video['description'], 
-                        video['channel_title']
-                    ):
-                        afrobeats_videos.append(video)
-                        keyword_videos += 1
-                
-                print(f"   ✅ Found {keyword_videos} authentic Afrobeats videos")
-                time.sleep(0.2)
+        afrobeats_videos = {}
+        seen = set()
+        
+        # Each keyword is searched per time window: YouTube caps results per
+        # query, so narrower windows surface more unique videos
+        windows = self._search_windows()
+        
+        results = asyncio.run(self._search_all(windows))
+        
+        # Collect in keyword order so the output reads the same as a serial run
+        for keyword, keyword_results in zip(self.afrobeats_keywords, results):
+            print(f"\n   🎯 Searching: {keyword}")
+            candidates = []
+            errors = []
+            for result in keyword_results:
+                if isinstance(result, Exception):
+                    # Report each distinct error once per keyword (e.g. one quotaExceeded, not five)
+                    if str(result) not in errors:
+                        errors.append(str(result))
+                        print(f"   ❌ Error: {result}")
+                    continue
+                candidates.extend(result)
+            
+            keyword_videos = 0
+            for video in candidates:
+                # Skip videos another keyword already returned
+                vid = video['video_id']
+                if vid in seen:
+                    continue
+                seen.add(vid)
                 
-            except HttpError as e:
-                print(f"   ❌ Error: {e}")
-                continue
+                # STRICT filtering
+                if self.is_authentic_afrobeats(
+                    video['title'], 
+                    video['description'], 
+                    video['channel_title']
+                ):
+                    afrobeats_videos[vid] = video
+                    keyword_videos += 1
+            
+            print(f"   ✅ Found {keyword_videos} new authentic Afrobeats videos")
         
-        # Remove duplicates
-        unique_videos = {v['video_id']: v for v in afrobeats_videos}
-        total = len(unique_videos)
+        total = len(afrobeats_videos)
         print(f"\n✅ Total authentic Afrobeats videos found: {total}")
         
         if total == 0:
             print("❌ No authentic Afrobeats content found!")
             print("💡 Try adjusting search criteria or keywords")
             
-        return list(unique_videos.values())
+        return list(afrobeats_videos.values())
     
-    def get_video_and_channel_stats(self, videos):
-        """Get detailed stats for filtering"""
-        print("📊 Getting video and channel statistics...")
+    def _load_stats_cache(self):
+        """Load cached stats batches and their ETags from disk"""
+        try:
+            with open(self.stats_cache_file, 'rb') as f:
+                cache = orjson.loads(f.read())
+        except (OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict):
+            cache = {}
+        return self._valid_cache_entries(cache.get('videos')), self._valid_cache_entries(cache.get('channels'))
+    
+    def _valid_cache_entries(self, section):
+        """Keep only well-formed {'etag', 'stats'} entries; anything else is a cache miss"""
+        if not isinstance(section, dict):
+            return {}
+        return {
+            ids_csv: entry for ids_csv, entry in section.items()
+            if isinstance(entry, dict)
+            and isinstance(entry.get('etag'), str)
+            and isinstance(entry.get('stats'), dict)
+        }
+    
+    def _plan_batches(self, ids, cache):
+        """Reuse cached batches whose IDs are all still wanted, then chunk the rest into fresh batches"""
+        wanted = set(ids)
+        batches = []
+        for ids_csv in cache:
+            batch_ids = set(ids_csv.split(','))
+            if batch_ids <= wanted:
+                batches.append(ids_csv)
+                wanted -= batch_ids
+        batches.extend(','.join(batch) for batch in _chunks(sorted(wanted), 50))
+        return batches
+    
+    def _save_stats_cache(self, video_cache, channel_cache):
+        """Persist stats batches and their ETags for the next run"""
+        try:
+            with open(self.stats_cache_file, 'wb') as f:
+                f.write(orjson.dumps({'videos': video_cache, 'channels': channel_cache}))
+        except OSError as e:
+            print(f"   ⚠️  Could not save stats cache: {e}")
+    
+    def _revalidate(self, request, cached):
+        """Execute a list request, returning None when the cached ETag is still current"""
+        if cached:
+            request.headers['If-None-Match'] = cached['etag']
+        try:
+            return self._api_call(request)
+        except HttpError as e:
+            if cached and e.resp.status == 304:
+                return None
+            raise
+    
+    def _fetch_video_batch(self, ids_csv, cached=None):
+        """Fetch stats for up to 50 comma-separated video IDs as an {'etag', 'stats'} cache entry"""
+        response = self._revalidate(self._service().videos().list(
+            part='statistics,contentDetails,snippet',
+            id=ids_csv,
+            fields='etag,items(id,statistics(viewCount,likeCount,commentCount),contentDetails/duration,snippet/tags)'
+        ), cached)
+        if response is None:
+            return cached
         
-        # Get video stats
-        video_ids = [v['video_id'] for v in videos]
         video_stats = {}
+        for video in response['items']:
+            stats = video['statistics']
+            video_stats[video['id']] = {
+                'view_count': int(stats.get('viewCount', 0)),
+                'like_count': int(stats.get('likeCount', 0)),
+                'comment_count': int(stats.get('commentCount', 0)),
+                'duration': video['contentDetails']['duration'],
+                # snippet is omitted entirely when the video has no tags
+                'tags': video.get('snippet', {}).get('tags', [])
+            }
+        return {'etag': response['etag'], 'stats': video_stats}
+    
+    def _fetch_channel_batch(self, ids_csv, cached=None):
+        """Fetch stats for up to 50 comma-separated channel IDs as an {'etag', 'stats'} cache entry"""
+        response = self._revalidate(self._service().channels().list(
+            part='statistics,snippet',
+            id=ids_csv,
+            fields='etag,items(id,statistics(subscriberCount,viewCount,videoCount),snippet(country,description))'
+        ), cached)
+        if response is None:
+            return cached
         
-        for i in range(0, len(video_ids), 50):
-            batch = video_ids[i:i+50]
-            try:
-                response = self.youtube.videos().list(
-                    part='statistics,contentDetails,snippet',
-                    id=','.join(batch)
-                ).execute()
-                
-                for video in response['items']:
-                    stats = video['statistics']
-                    video_stats[video['id']] = {
-                        'view_count': int(stats.get('viewCount', 0)),
-                        'like_count': int(stats.get('likeCount', 0)),
-                        'comment_count': int(stats.get('commentCount', 0)),
-                        'duration': video['contentDetails']['duration'],
-                        'tags': video['snippet'].get('tags', [])
-                    }
-                time.sleep(0.1)
-            except Exception as e:
-                print(f"   Error getting video stats: {e}")
-                continue
-        
-        # Get channel stats
-        print("👥 Getting channel statistics...")
-        channel_ids = list(set([v['channel_id'] for v in videos]))
         channel_stats = {}
+        for channel in response['items']:
+            stats = channel['statistics']
+            snippet = channel.get('snippet', {})
+            channel_stats[channel['id']] = {
+                'subscriber_count': int(stats.get('subscriberCount', 0)),
+                'view_count': int(stats.get('viewCount', 0)),
+                'video_count': int(stats.get('videoCount', 0)),
+                'country': snippet.get('country', ''),
+                'description': snippet.get('description', '')
+            }
+        return {'etag': response['etag'], 'stats': channel_stats}
+    
+    def get_video_and_channel_stats(self, videos):
+        """Get detailed stats for filtering"""
+        print("📊 Getting video and channel statistics...")
         
-        for i in range(0, len(channel_ids), 50):
-            batch = channel_ids[i:i+50]
-            try:
-                response = self.youtube.channels().list(
-                    part='statistics,snippet',
-                    id=','.join(batch)
-                ).execute()
-                
-                for channel in response['items']:
-                    stats = channel['statistics']
-                    snippet = channel['snippet']
-                    channel_stats[channel['id']] = {
-                        'subscriber_count': int(stats.get('subscriberCount', 0)),
-                        'view_count': int(stats.get('viewCount', 0)),
-                        'video_count': int(stats.get('videoCount', 0)),
-                        'country': snippet.get('country', ''),
-                        'description': snippet.get('description', '')
-                    }
-                time.sleep(0.1)
-            except Exception as e:
-                print(f"   Error getting channel stats: {e}")
-                continue
+        # An ETag covers a whole list response, so cached batches are only
+        # revalidated as-is; IDs outside them go out in fresh batches
+        video_cache, channel_cache = self._load_stats_cache()
+        video_batches = self._plan_batches((v['video_id'] for v in videos), video_cache)
+        channel_batches = self._plan_batches((v['channel_id'] for v in videos), channel_cache)
+        
+        # Video and channel batches are independent, so fetch them all at once
+        with ThreadPoolExecutor(max_workers=self.stats_workers) as executor:
+            video_futures = [
+                (b, executor.submit(self._fetch_video_batch, b, video_cache.get(b)))
+                for b in video_batches
+            ]
+            channel_futures = [
+                (b, executor.submit(self._fetch_channel_batch, b, channel_cache.get(b)))
+                for b in channel_batches
+            ]
+            
+            # Only batches seen this run are kept, so the cache doesn't grow forever
+            new_video_cache = {}
+            video_stats = {}
+            for ids_csv, future in video_futures:
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    print(f"   Error getting video stats: {e}")
+                    continue
+                new_video_cache[ids_csv] = entry
+                video_stats.update(entry['stats'])
+            
+            print("👥 Getting channel statistics...")
+            new_channel_cache = {}
+            channel_stats = {}
+            for ids_csv, future in channel_futures:
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    print(f"   Error getting channel stats: {e}")
+                    continue
+                new_channel_cache[ids_csv] = entry
+                channel_stats.update(entry['stats'])
         
+        self._save_stats_cache(new_video_cache, new_channel_cache)
         return video_stats, channel_stats
     
     def filter_up_and_coming_artists(self, videos, video_stats, channel_stats):
         """Filter for up-and-coming artists with double-check for Afrobeats"""
         print("🎯 Filtering for up-and-coming Afrobeats artists...")
         
+        max_subscribers = self.max_subscribers
+        max_channel_views = self.max_channel_views
+        min_video_views = self.min_video_views
+        
         filtered = []
         for video in videos:
             vid_id = video['video_id']
@@ -307,27 +594,24 @@ class AfrobeatsPlaylistGenerator:
             
             # Size criteria for up-and-coming
             meets_size_criteria = (
-                c_stats['subscriber_count'] <= self.max_subscribers and
-                c_stats['view_count'] <= self.max_channel_views and
-                v_stats['view_count'] >= self.min_video_views
+                c_stats['subscriber_count'] <= max_subscribers and
+                c_stats['view_count'] <= max_channel_views and
+                v_stats['view_count'] >= min_video_views
             )
             
             if not meets_size_criteria:
                 continue
             
-            # Double-check for Afrobeats with tags
-            is_afrobeats = self.is_authentic_afrobeats(
-                video['title'],
-                video['description'],
-                video['channel_title'],
-                v_stats.get('tags', [])
-            )
+            # Double-check for Afrobeats with tags. The video already passed
+            # on its text, and extra tag terms can only raise its score, so
+            # only an excluded term in the tags can change the verdict
+            tags = v_stats.get('tags', [])
+            is_afrobeats = not (tags and self._exclude_re.search(' '.join(tags).lower()))
             
             if is_afrobeats:
-                video.update(v_stats)
-                video.update(c_stats)
-                filtered.append(video)
-                print(f"   ✅ {video['channel_title']}: {video['title'][:40]}... ({video['subscriber_count']:,} subs)")
+                # One merged dict per survivor; channel stats win on shared keys as before
+                filtered.append({**video, **v_stats, **c_stats})
+                print(f"   ✅ {video['channel_title']}: {video['title'][:40]}... ({c_stats['subscriber_count']:,} subs)")
         
         print(f"\n✅ Found {len(filtered)} up-and-coming Afrobeats artists!")
         return filtered
@@ -341,8 +625,8 @@ class AfrobeatsPlaylistGenerator:
             print("❌ No videos to create playlist with")
             return None
         
-        # Sort by views
-        sorted_videos = sorted(videos, key=lambda x: x['view_count'], reverse=True)
+        # Top videos by views (max 50, also the batch limit)
+        top_videos = nlargest(50, videos, key=itemgetter('view_count'))
         
         # Create playlist with simple name
         today = datetime.now().strftime('%Y-%m-%d')
@@ -352,7 +636,7 @@ class AfrobeatsPlaylistGenerator:
             print(f"🎵 Creating NEW YouTube playlist: '{playlist_name}'")
             
             # Create the playlist
-            playlist_response = self.youtube.playlists().insert(
+            playlist_response = self._api_call(self.youtube.playlists().insert(
                 part='snippet,status',
                 body={
                     'snippet': {
@@ -363,7 +647,7 @@ class AfrobeatsPlaylistGenerator:
                         'privacyStatus': 'public'
                     }
                 }
-            ).execute()
+            ))
             
             playlist_id = playlist_response['id']
             playlist_url = f"https://www.youtube.com/playlist?list={playlist_id}"
@@ -372,35 +656,39 @@ class AfrobeatsPlaylistGenerator:
             print(f"📍 Playlist ID: {playlist_id}")
             print(f"🔗 URL: {playlist_url}")
             
-            # Add videos one by one
-            print(f"\n📥 Adding {len(sorted_videos)} videos to playlist...")
-            added = 0
+            # Add all videos in a single batch request
+            print(f"\n📥 Adding {len(top_videos)} videos to playlist...")
+            pending = {}
+            inserted = []
+            failed = []
+            batch = self.youtube.new_batch_http_request(
+                callback=partial(self._on_insert, pending, inserted, failed)
+            )
+            
+            for i, video in enumerate(top_videos):
+                request_id = str(i)
+                pending[request_id] = video
+                batch.add(self._playlist_item_insert(playlist_id, video), request_id=request_id)
+            
+            self._api_call(batch)
             
-            for i, video in enumerate(sorted_videos[:50]):  # Max 50 videos
+            # Concurrent inserts into one playlist are often rejected (409/503),
+            # so retry those one at a time, in view order
+            if failed:
+                print(f"\n🔁 Retrying {len(failed)} videos one by one...")
+            for request_id in sorted(failed, key=int):
+                video = pending[request_id]
                 try:
-                    self.youtube.playlistItems().insert(
-                        part='snippet',
-                        body={
-                            'snippet': {
-                                'playlistId': playlist_id,
-                                'position': i,
-                                'resourceId': {
-                                    'kind': 'youtube#video',
-                                    'videoId': video['video_id']
-                                }
-                            }
-                        }
-                    ).execute()
-                    
-                    added += 1
-                    print(f"   {added:2d}. ✅ {video['title'][:45]}... ({video['view_count']:,} views)")
-                    time.sleep(0.3)  # Slower to avoid issues
-                    
+                    self._api_call(self._playlist_item_insert(playlist_id, video))
                 except HttpError as e:
                     print(f"   ❌ Failed to add: {video['title'][:30]}... ({e})")
                     continue
+                inserted.append(video)
+                print(f"   {len(inserted):2d}. ✅ {video['title'][:45]}... ({video['view_count']:,} views)")
             
+            added = len(inserted)
             print(f"\n🎉 SUCCESS! Added {added} Afrobeats videos to your playlist!")
+            print("ℹ️  Videos were added in one batch, so the playlist is not ordered by views")
             print(f"🔗 Your playlist: {playlist_url}")
             
             return playlist_url
@@ -409,16 +697,44 @@ class AfrobeatsPlaylistGenerator:
             print(f"❌ Failed to create playlist: {e}")
             return self.create_manual_instructions(videos)
     
+    def _playlist_item_insert(self, playlist_id, video):
+        """Build a playlistItems.insert request appending one video"""
+        # No explicit position: batched calls may run in any order,
+        # and a position past the current end of the playlist is rejected
+        return self.youtube.playlistItems().insert(
+            part='snippet',
+            body={
+                'snippet': {
+                    'playlistId': playlist_id,
+                    'resourceId': {
+                        'kind': 'youtube#video',
+                        'videoId': video['video_id']
+                    }
+                }
+            }
+        )
+    
+    def _on_insert(self, pending, inserted, failed, request_id, response, exception):
+        """Batch callback for a single playlistItems.insert"""
+        video = pending[request_id]
+        if exception is not None:
+            # Retried serially once the batch is done
+            failed.append(request_id)
+            return
+        
+        inserted.append(video)
+        print(f"   {len(inserted):2d}. ✅ {video['title'][:45]}... ({video['view_count']:,} views)")
+    
     def create_manual_instructions(self, videos):
         """Create manual playlist instructions (not Watch Later!)"""
         print("📝 Creating manual playlist instructions...")
         
-        sorted_videos = sorted(videos, key=lambda x: x['view_count'], reverse=True)
+        top_videos = nlargest(20, videos, key=itemgetter('view_count'))
         today = datetime.now().strftime('%Y-%m-%d')
         
         instructions = {
             'playlist_name': f"Afrobeats Up and Coming {today}",
-            'total_videos': len(sorted_videos),
+            'total_videos': len(videos),
             'instructions': [
                 "1. Go to https://www.youtube.com/",
                 "2. Click your profile picture → 'Your channel'",
@@ -433,7 +749,7 @@ class AfrobeatsPlaylistGenerator:
         print(f"\n📋 MANUAL PLAYLIST CREATION GUIDE")
         print(f"{'='*50}")
         print(f"Playlist name: {instructions['playlist_name']}")
-        print(f"Total videos: {len(sorted_videos)}")
+        print(f"Total videos: {len(videos)}")
         print(f"\n📝 Instructions:")
         for instruction in instructions['instructions']:
             print(f"   {instruction}")
@@ -441,7 +757,7 @@ class AfrobeatsPlaylistGenerator:
         print(f"\n🎵 VIDEOS TO ADD:")
         print(f"{'='*50}")
         
-        for i, video in enumerate(sorted_videos[:20], 1):
+        for i, video in enumerate(top_videos, 1):
             video_url = f"https://youtube.com/watch?v={video['video_id']}"
             instructions['videos'].append({
                 'position': i,
@@ -458,8 +774,8 @@ class AfrobeatsPlaylistGenerator:
             print()
         
         # Save to file
-        with open('afrobeats_manual_playlist.json', 'w', encoding='utf-8') as f:
-            json.dump(instructions, f, indent=2, ensure_ascii=False)
+        with open('afrobeats_manual_playlist.json', 'wb') as f:
+            f.write(orjson.dumps(instructions, option=orjson.OPT_INDENT_2))
         
         print(f"💾 Instructions saved to 'afrobeats_manual_playlist.json'")
         
@@ -509,6 +825,11 @@ class AfrobeatsPlaylistGenerator:
             print(f"❌ Error: {e}")
 
 def main():
+    # Unknown LOG_LEVEL values (e.g. a typo in .env) fall back to INFO
+    level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+    logging.basicConfig(level=level, format='%(message)s')
     creator = AfrobeatsPlaylistGenerator()
     creator.run()
 